@@ -0,0 +1,23 @@
+# Ahead-of-time compiles the CSR traversal kernels of mixed_graph with numba.pycc, so the first
+# traversal does not pay the JIT compilation. Run `python _kernels_build.py` (requires numba and a
+# C compiler); it writes the mixed_graph_kernels extension next to mixed_graph.py, which picks it up
+# on import and otherwise falls back to the JIT (or plain Python) kernels.
+import os
+import sys
+
+from numba.pycc import CC
+
+# Make sure the kernels are taken from their Python source, not from a previous build.
+sys.modules['mixed_graph_kernels'] = None
+import mixed_graph  # noqa: E402
+
+cc = CC('mixed_graph_kernels')
+cc.output_dir = os.path.dirname(os.path.abspath(__file__))
+
+cc.export('bfs_csr', 'void(i4[:], i4[:], i4, u1[:], i4[:], i4[:])')(mixed_graph._bfs_csr.py_func)
+cc.export('bfs_hybrid_csr', 'void(i4[:], i4[:], i4[:], i4[:], i4, u1[:], i4[:], i4[:])')(mixed_graph._bfs_hybrid_csr.py_func)
+cc.export('dfs_csr', 'b1(i4[:], i4[:], u1[:], u1[:], i4[:], i4[:], i4[:])')(mixed_graph._dfs_csr.py_func)
+cc.export('detect_cycle_csr', 'b1(i4[:], i4[:], u1[:])')(mixed_graph._detect_cycle_csr.py_func)
+
+if __name__ == '__main__':
+    cc.compile()
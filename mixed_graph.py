@@ -1,269 +1,793 @@
-from collections import deque
-
-
-class Vertex:
-    # Represents a vertex in the graph, accepts a value and a list of *outgoing* (directed) neighbor values.
-    def __init__(self, value, neighbors=None):
-        self.value = value
-        self.neighbors = {neighbor : 'directed' for neighbor in neighbors} if neighbors else dict()
-        self.color = 'white'
-        self.d = float('inf')
-        self.f = float('inf')
-        self.parent = None
-
-    def __eq__(self, other):
-        if not isinstance(other, Vertex):
-            return False
-
-        return self.value == other.value
-
-    def __hash__(self):
-        return hash(self.value)
-
-    def __repr__(self):
-        return f"V({self.value!r})"
-
-
-class Graph:
-    # Represents a directed graph, accepts a list of vertices (values).
-    def __init__(self, vertices=None):
-        self.vertices = {val: Vertex(val) for val in vertices} if vertices else dict()
-
-        # Indicates whether the graph has a cycle (using DFS).
-        self.dfs_cycle = False
-
-        # Indicates whether the DFS is up to date.
-        self.updated_dfs = False
-
-        # Indicates whether the BFS is up to date.
-        self.updated_bfs = False
-        self.source = None
-
-        # Indicates the type of the graph (directed, undirected, mixed).
-        self.undirected_edges = 0
-        self.directed_edges = 0
-
-    def __repr__(self):
-        edge_list = [(u, v, self.vertices[u].neighbors[v]) for u in self.vertices for v in self.vertices[u].neighbors]
-        return f"Graph(vertices={list(self.vertices)}, edges={edge_list})"
-
-    # Returns the vertex with the given value if it exists.
-    def get(self, value):
-        return self.vertices.get(value)
-
-    # Adds a vertex to the graph if it does not already exists (value based).
-    def add_vertex(self, value):
-        if value not in self.vertices:
-            self.reset(False)
-
-            self.vertices[value] = Vertex(value)
-
-    # Removes a vertex from the graph if it exists (value based).
-    def remove_vertex(self, value):
-        if value in self.vertices:
-            self.reset(True)
-
-            # Remove all outgoing edges from the vertex
-            for neighbor in list(self.get(value).neighbors.keys()):
-                self.disconnect(value, neighbor)
-
-            # Remove the vertex from all neighbors' lists
-            for neighbor in self.vertices:
-                self.disconnect(neighbor, value)
-
-            # Remove the vertex itself
-            self.vertices.pop(value)
-
-    # Checks if the graph has a cycle using DFS.
-    def has_cycle(self):
-        if not self.updated_dfs:
-            self.dfs()
-
-        return self.dfs_cycle
-    
-    # Returns the type of the graph based on the edges.
-    def type(self):
-        if self.undirected_edges > 0 and self.directed_edges > 0:
-            return 'mixed'
-        elif self.undirected_edges > 0:
-            return 'undirected'
-        else:
-            return 'directed'
-
-    # Connects two vertices in a *directed* graph (value based).
-    # If an undirected edge already exists between the vertices, it will be overwritten.
-    def connect_directed(self, source, destination):
-        if source != destination:
-            # add vertices if they do not exist and reset the graph if necessary
-            self.reset(False)
-
-            self.add_vertex(source)
-            self.add_vertex(destination)
-
-            # If the connection already exists as undirected, remove it
-            if self.vertices[source].neighbors.get(destination) == 'undirected':
-                self.undirected_edges -= 1
-                self.vertices[source].neighbors.pop(destination, None)
-                self.vertices[destination].neighbors.pop(source, None)
-
-            # If the directed edge does not already exist, add it
-            if self.vertices[source].neighbors.get(destination) != 'directed':   
-                self.directed_edges += 1
-                self.vertices[source].neighbors[destination] = 'directed'
-
-    # Connects two vertices in a *undirected* graph (value based).
-    # If a directed edge already exists between the vertices, it will be overwritten.
-    def connect_undirected(self, source, destination):
-        if source != destination:
-            # add vertices if they do not exist and reset the graph if necessary
-            self.reset(False)
-
-            self.add_vertex(source)
-            self.add_vertex(destination)
-
-            # If the connection already exists as directed, remove it
-            if self.vertices[source].neighbors.get(destination) == 'directed':
-                self.directed_edges -= 1
-                self.vertices[source].neighbors.pop(destination, None)
-
-            if self.vertices[destination].neighbors.get(source) == 'directed':
-                self.directed_edges -= 1
-                self.vertices[destination].neighbors.pop(source, None)
-
-            # If the undirected edge does not already exist, add it
-            if self.vertices[source].neighbors.get(destination) != 'undirected':
-                self.undirected_edges += 1
-                self.vertices[source].neighbors[destination] = 'undirected'
-                self.vertices[destination].neighbors[source] = 'undirected'
-
-    # Disconnects two vertices connection depending on the type of connection (value based).
-    # If the edge between destination → source is undirected, both directions will be removed.
-    # Otherwise, only the source → destination connection is removed (if it exists).
-    def disconnect(self, source, destination):
-        if source != destination and source in self.vertices and destination in self.vertices:
-            self.reset(False)
-
-            if self.vertices[destination].neighbors.get(source) == 'undirected':
-                self.undirected_edges -= 1
-                self.vertices[destination].neighbors.pop(source, None)
-                self.vertices[source].neighbors.pop(destination, None)
-
-            elif self.vertices[source].neighbors.get(destination) == 'directed':
-                self.directed_edges -= 1
-                self.vertices[source].neighbors.pop(destination, None)
-
-    # Returns the neighbors of a vertex (values).
-    def get_neighbors(self, value):
-        if value in self.vertices:
-            return set(self.vertices[value].neighbors.keys())
-
-        else:
-            return set()
-        
-    # **helper** Paints a vertex with a specific color.
-    def paint(self, value, color):
-        if value in self.vertices and color in ['white', 'gray', 'black']:
-            self.vertices[value].color = color
-
-    # **helper** Resets the properties of all vertices in the graph.
-    def reset(self, hard_reset=False):
-        self.updated_dfs = False
-        self.updated_bfs = False
-        self.dfs_cycle = False
-
-        if hard_reset:
-            for val in self.vertices.values():
-                val.color = 'white'
-                val.d = float('inf')
-                val.f = float('inf')
-                val.parent = None
-
-    # Performs a depth-first search (DFS) on the graph.
-    def dfs(self):
-        self.reset(True)
-
-        time = 0
-
-        # Recursive DFS function
-        def dfs_rec(vertex, parent=None):
-            nonlocal time
-
-            self.get(vertex).color = 'gray'
-            time += 1
-            self.get(vertex).d = time
-
-            for neighbor, edge_type in self.get(vertex).neighbors.items():
-                if self.get(neighbor).color == 'white':
-                    dfs_rec(neighbor, vertex)
-
-                if self.get(neighbor).color == 'gray' and edge_type == 'directed':
-                    # Found a back edge in a directed graph
-                    self.dfs_cycle = True
-
-                elif self.get(neighbor).color == 'gray' and edge_type == 'undirected' and neighbor != parent:
-                    # Found a back edge in an undirected graph
-                    self.dfs_cycle = True
-
-            self.get(vertex).color = 'black'
-            time += 1
-            self.get(vertex).f = time
-
-        # Start DFS from each unvisited vertex
-        for vertex in self.vertices:
-            if self.get(vertex).color == 'white':
-                dfs_rec(vertex)
-
-        self.updated_dfs = True
-
-    # Performs a breadth-first search (BFS) starting from the source vertex.
-    def bfs(self, source):
-        self.reset(True)
-        self.source = source
-
-        q = deque()
-
-        q.append(source)
-        self.get(source).color = 'gray'
-        self.get(source).d = 0
-
-        while q:
-            vertex = q.popleft()
-            for neighbor in self.get(vertex).neighbors.keys():
-                if self.get(neighbor).color == 'white':
-
-                    q.append(neighbor)
-                    self.get(neighbor).color = 'gray'
-                    self.get(neighbor).d = self.get(vertex).d + 1
-                    self.get(neighbor).parent = vertex
-
-            self.get(vertex).color = 'black'
-
-        self.updated_bfs = True
-
-    # Returns the shortest path from source to target using BFS.
-    def path(self, source, target):
-        if source not in self.vertices or target not in self.vertices:
-            return []
-        if not self.updated_bfs or self.source != source:
-            self.bfs(source)
-        if source == target:
-            return [source]
-        if self.get(target).parent is None:
-            return []
-
-        res = []
-        tmp = target
-        while tmp:
-            res.append(tmp)
-            tmp = self.get(tmp).parent
-        res.reverse()
-        return res
-    
-    # Returns a topological sort of the graph if it is a Directed Acyclic Graph (DAG).
-    def topological_sort(self):
-        # Check if the graph has a cycle and make sure DFS is valid
-        if self.has_cycle() or self.type() != 'directed':
-            return None
-
-        return [vertex.value for vertex in sorted(self.vertices.values(), key = lambda vertex : vertex.f, reverse = True)]
-        
+from collections import OrderedDict
+from collections.abc import Mapping
+
+import numpy as np
+
+try:
+    from numba import njit
+    _COMPILED_KERNELS = True
+except ImportError:
+    # numba is optional, without it the kernels below run as plain Python.
+    _COMPILED_KERNELS = False
+
+    def njit(*args, **kwargs):
+        if len(args) == 1 and callable(args[0]):
+            return args[0]
+        return lambda func: func
+
+# Traversal colors as stored in the color array: unvisited, in progress, finished.
+WHITE, GRAY, BLACK = 0, 1, 2
+_COLOR_NAMES = ('white', 'gray', 'black')
+_COLOR_CODES = {'white': WHITE, 'gray': GRAY, 'black': BLACK}
+
+# Edge kinds as stored in the adjacency and the CSR edge kind array.
+_DIRECTED, _UNDIRECTED = 1, 2
+_EDGE_KIND_NAMES = {_DIRECTED: 'directed', _UNDIRECTED: 'undirected'}
+
+# Placeholder value of removed vertex ids, until the ids are compacted.
+_REMOVED = object()
+
+# Number of BFS results (per source) kept for path queries.
+_BFS_CACHE_SIZE = 8
+
+# Direction-optimizing BFS (Beamer et al.): used (with compiled kernels) from this many vertices and this average
+# number of neighbor entries per vertex on, below which its bottom-up scans of every white vertex cost more than they
+# save; switches to bottom-up when the frontier's edges exceed 1 / _BFS_ALPHA of the unexplored edges, and back to
+# top-down when the frontier shrinks below 1 / _BFS_BETA of the vertices.
+_HYBRID_BFS_MIN_VERTICES = 4096
+_HYBRID_BFS_MIN_DEGREE = 4
+_BFS_ALPHA = 14
+_BFS_BETA = 24
+
+# Numpy level-synchronous BFS (uncompiled kernels only): levels with fewer edges to expand are walked one vertex at a
+# time instead.
+_LEVEL_BFS_MIN_EDGES = 256
+
+
+# Breadth-first search kernel over a CSR graph, starting from the vertex id `source`.
+# Fills color, d (distance) and parent (-1 for the root / unreachable vertices) in place.
+@njit(cache=True)
+def _bfs_csr(indptr, indices, source, color, d, parent):
+    queue = np.empty(color.shape[0], np.int32)
+    head = 0
+    tail = 1
+    queue[0] = source
+    color[source] = GRAY
+    d[source] = 0
+
+    while head < tail:
+        u = queue[head]
+        head += 1
+        for j in range(indptr[u], indptr[u + 1]):
+            v = indices[j]
+            if color[v] == WHITE:
+                color[v] = GRAY
+                d[v] = d[u] + 1
+                parent[v] = u
+                queue[tail] = v
+                tail += 1
+
+        color[u] = BLACK
+
+
+# Direction-optimizing breadth-first search kernel over a CSR graph and its reverse (in_indptr / in_indices).
+# Levels are expanded top-down (frontier → unvisited neighbors) or, while the frontier is large, bottom-up
+# (every unvisited vertex looks for any in-neighbor in the frontier and stops at the first one).
+# Fills color, d and parent like _bfs_csr; d is identical, parent may be any shortest-path predecessor.
+@njit(cache=True)
+def _bfs_hybrid_csr(indptr, indices, in_indptr, in_indices, source, color, d, parent):
+    n = color.shape[0]
+    frontier = np.empty(n, np.int32)
+    next_frontier = np.empty(n, np.int32)
+    in_frontier = np.zeros(n, np.uint8)
+
+    frontier[0] = source
+    size = 1
+    color[source] = GRAY
+    d[source] = 0
+
+    unexplored_edges = indices.shape[0]
+    bottom_up = False
+    level = 0
+
+    while size > 0:
+        level += 1
+        frontier_edges = 0
+        for k in range(size):
+            u = frontier[k]
+            frontier_edges += indptr[u + 1] - indptr[u]
+        unexplored_edges -= frontier_edges
+
+        if not bottom_up and frontier_edges * _BFS_ALPHA > unexplored_edges:
+            bottom_up = True
+        elif bottom_up and size * _BFS_BETA < n:
+            bottom_up = False
+
+        next_size = 0
+        if bottom_up:
+            for k in range(size):
+                in_frontier[frontier[k]] = 1
+
+            for v in range(n):
+                if color[v] == WHITE:
+                    for j in range(in_indptr[v], in_indptr[v + 1]):
+                        u = in_indices[j]
+                        if in_frontier[u]:
+                            color[v] = GRAY
+                            d[v] = level
+                            parent[v] = u
+                            next_frontier[next_size] = v
+                            next_size += 1
+                            break
+
+            for k in range(size):
+                in_frontier[frontier[k]] = 0
+
+        else:
+            for k in range(size):
+                u = frontier[k]
+                for j in range(indptr[u], indptr[u + 1]):
+                    v = indices[j]
+                    if color[v] == WHITE:
+                        color[v] = GRAY
+                        d[v] = level
+                        parent[v] = u
+                        next_frontier[next_size] = v
+                        next_size += 1
+
+        for k in range(size):
+            color[frontier[k]] = BLACK
+
+        frontier, next_frontier = next_frontier, frontier
+        size = next_size
+
+
+# Level-synchronous breadth-first search over a CSR graph with numpy: every level with at least
+# _LEVEL_BFS_MIN_EDGES edges to expand is expanded at once, so the per-edge work happens in numpy instead of the
+# interpreter; smaller levels (e.g. all of a long path) are walked with a plain loop, which is cheaper than the fixed
+# cost of the array operations. Produces the same color, d and parent arrays as _bfs_csr (parents are the first
+# frontier vertex, in queue order, reaching a vertex).
+def _bfs_levels(indptr, indices, source, color, d, parent):
+    ptr = indptr.tolist()
+    frontier = [source]
+    total = ptr[source + 1] - ptr[source]
+    color[source] = GRAY
+    d[source] = 0
+    level = 0
+
+    while len(frontier):
+        level += 1
+        if total < _LEVEL_BFS_MIN_EDGES:
+            next_frontier = []
+            total = 0
+            for u in frontier:
+                color[u] = BLACK
+                for v in indices[ptr[u]:ptr[u + 1]].tolist():
+                    if color[v] == WHITE:
+                        color[v] = GRAY
+                        d[v] = level
+                        parent[v] = u
+                        next_frontier.append(v)
+                        total += ptr[v + 1] - ptr[v]
+
+            frontier = next_frontier
+            continue
+
+        frontier = np.asarray(frontier, np.int32)
+        starts = indptr[frontier]
+        counts = indptr[frontier + 1] - starts
+        color[frontier] = BLACK
+
+        # CSR positions of all the frontier's edges, in queue order
+        offsets = np.cumsum(counts) - counts
+        edges = np.repeat(starts - offsets, counts) + np.arange(total)
+        succ = indices[edges]
+        src = np.repeat(frontier, counts)
+
+        mask = color[succ] == WHITE
+        succ = succ[mask]
+        src = src[mask]
+
+        # Scatter the sources in reverse so every vertex keeps its first discovery, then keep the edges that won
+        # (a vertex is reached at most once per source), which are already in discovery order
+        parent[succ[::-1]] = src[::-1]
+        frontier = succ[parent[succ] == src]
+
+        color[frontier] = GRAY
+        d[frontier] = level
+        total = int((indptr[frontier + 1] - indptr[frontier]).sum())
+
+
+# Iterative depth-first search kernel over a CSR graph, using an explicit stack instead of recursion.
+# Fills color, d (discovery) and f (finish) times and the vertex ids in finishing order in place, and returns
+# whether a back edge was found: a directed edge to a gray vertex, or an undirected edge to a gray vertex
+# other than the DFS parent.
+@njit(cache=True)
+def _dfs_csr(indptr, indices, kinds, color, d, f, order):
+    n = color.shape[0]
+    stack = np.empty(n, np.int32)
+    cursor = np.empty(n, np.int32)
+    time = 0
+    done = 0
+    cycle = False
+
+    for root in range(n):
+        if color[root] != WHITE:
+            continue
+
+        top = 0
+        stack[0] = root
+        cursor[root] = indptr[root]
+        color[root] = GRAY
+        time += 1
+        d[root] = time
+
+        while top >= 0:
+            u = stack[top]
+            j = cursor[u]
+
+            # All neighbors explored, finish the vertex
+            if j == indptr[u + 1]:
+                color[u] = BLACK
+                time += 1
+                f[u] = time
+                order[done] = u
+                done += 1
+                top -= 1
+                continue
+
+            cursor[u] = j + 1
+            v = indices[j]
+            if color[v] == WHITE:
+                top += 1
+                stack[top] = v
+                cursor[v] = indptr[v]
+                color[v] = GRAY
+                time += 1
+                d[v] = time
+
+            else:
+                # Back edge test without branching on the edge kind (the root has no DFS parent)
+                parent = stack[top - 1] if top > 0 else -1
+                cycle |= (color[v] == GRAY) & ((kinds[j] == _DIRECTED) | (v != parent))
+
+    return cycle
+
+
+# Colors packed 2 bits per vertex (4 vertices per byte), so the color bitmap of cycle detection stays cache resident.
+@njit(cache=True)
+def _get_color(bits, i):
+    return (bits[i >> 2] >> ((i & 3) << 1)) & 3
+
+
+@njit(cache=True)
+def _set_color(bits, i, color):
+    shift = (i & 3) << 1
+    bits[i >> 2] = (bits[i >> 2] & (0xFF ^ (3 << shift))) | (color << shift)
+
+
+# Cycle detection kernel over a CSR graph: an iterative DFS that only tracks colors (no timestamps, colors
+# packed in a 2-bit bitmap) and stops at the first back edge, using the same back edge rules as _dfs_csr.
+@njit(cache=True)
+def _detect_cycle_csr(indptr, indices, kinds):
+    n = indptr.shape[0] - 1
+    bits = np.zeros((n + 3) // 4, np.uint8)
+    stack = np.empty(n, np.int32)
+    cursor = np.empty(n, np.int32)
+
+    for root in range(n):
+        if _get_color(bits, root) != WHITE:
+            continue
+
+        top = 0
+        stack[0] = root
+        cursor[root] = indptr[root]
+        _set_color(bits, root, GRAY)
+
+        while top >= 0:
+            u = stack[top]
+            j = cursor[u]
+
+            if j == indptr[u + 1]:
+                _set_color(bits, u, BLACK)
+                top -= 1
+                continue
+
+            cursor[u] = j + 1
+            v = indices[j]
+            color = _get_color(bits, v)
+            if color == WHITE:
+                top += 1
+                stack[top] = v
+                cursor[v] = indptr[v]
+                _set_color(bits, v, GRAY)
+
+            elif (color == GRAY) & ((kinds[j] == _DIRECTED) | (v != (stack[top - 1] if top > 0 else -1))):
+                return True
+
+    return False
+
+
+# Prefer the ahead-of-time compiled kernels when they were built (see _kernels_build.py).
+try:
+    from mixed_graph_kernels import bfs_csr as _bfs_csr, bfs_hybrid_csr as _bfs_hybrid_csr, dfs_csr as _dfs_csr, \
+        detect_cycle_csr as _detect_cycle_csr
+    _COMPILED_KERNELS = True
+except ImportError:
+    pass
+
+
+class Vertex:
+    # A read-only view of a vertex in a graph. Vertices are not stored as objects: the view reads its
+    # neighbors from the graph's adjacency and its traversal fields from the graph's per-vertex arrays.
+    __slots__ = ('graph', 'value')
+
+    def __init__(self, graph, value):
+        self.graph = graph
+        self.value = value
+
+    # Id of the vertex in the traversal arrays, None if the graph changed since they were filled
+    # (the fields then read as their defaults) or the vertex is not in the graph.
+    def _id(self):
+        if self.graph._csr_version != self.graph._graph_version:
+            return None
+
+        return self.graph._idx.get(self.value)
+
+    # Mapping neighbor value → edge kind ('directed' / 'undirected'), a copy (empty if the vertex was removed).
+    @property
+    def neighbors(self):
+        u = self.graph._idx.get(self.value)
+        if u is None:
+            return {}
+
+        values = self.graph._values
+        return {values[v]: _EDGE_KIND_NAMES[kind] for v, kind in self.graph._adj[u].items()}
+
+    @property
+    def color(self):
+        i = self._id()
+        return _COLOR_NAMES[self.graph._color[i]] if i is not None else 'white'
+
+    @property
+    def d(self):
+        i = self._id()
+        return int(self.graph._d[i]) if i is not None and self.graph._d[i] >= 0 else float('inf')
+
+    @property
+    def f(self):
+        i = self._id()
+        return int(self.graph._f[i]) if i is not None and self.graph._f[i] >= 0 else float('inf')
+
+    @property
+    def parent(self):
+        i = self._id()
+        return self.graph._values[self.graph._parent[i]] if i is not None and self.graph._parent[i] >= 0 else None
+
+    def __eq__(self, other):
+        if not isinstance(other, Vertex):
+            return False
+
+        return self.value == other.value
+
+    def __hash__(self):
+        return hash(self.value)
+
+    def __repr__(self):
+        return f"V({self.value!r})"
+
+
+class VertexMap(Mapping):
+    # A lazy read-only mapping vertex value → Vertex view over a graph's vertices (insertion ordered).
+    # Lookups, membership and length are O(1); a view is only created for the vertex being accessed.
+    __slots__ = ('graph',)
+
+    def __init__(self, graph):
+        self.graph = graph
+
+    def __getitem__(self, value):
+        if value not in self.graph._idx:
+            raise KeyError(value)
+
+        return Vertex(self.graph, value)
+
+    def __contains__(self, value):
+        return value in self.graph._idx
+
+    def __iter__(self):
+        return iter(self.graph._idx)
+
+    def __len__(self):
+        return len(self.graph._idx)
+
+    def __repr__(self):
+        return f"VertexMap({list(self.graph._idx)!r})"
+
+
+class Graph:
+    # Represents a directed graph, accepts a list of vertices (values).
+    def __init__(self, vertices=None):
+        # Integer vertex ids: value → id and id → value. User values are only hashed here, everything
+        # else (adjacency, CSR, traversal arrays) is indexed by id. Ids stay in insertion order.
+        self._idx = dict()
+        self._values = []
+
+        # Adjacency by id: id → {neighbor id → edge kind}, and reverse adjacency: id → ids listing it.
+        self._adj = []
+        self._in_neighbors = []
+
+        # Number of removed ids (see _REMOVED), compacted away on the next CSR build.
+        self._removed = 0
+
+        # Indicates whether the graph has a cycle (using DFS).
+        self.dfs_cycle = False
+
+        # Graph versions the last DFS / BFS ran on, see updated_dfs and updated_bfs.
+        self._dfs_version = -1
+        self._bfs_version = -1
+        self.source = None
+
+        # Recent BFS results used by path(): source → (graph version, parent, d), least recently used first.
+        self._bfs_cache = OrderedDict()
+
+        # Results of get_neighbors(): value → (graph version, frozenset of neighbor values).
+        self._neighbor_view_cache = dict()
+
+        # Indicates the type of the graph (directed, undirected, mixed).
+        self.undirected_edges = 0
+        self.directed_edges = 0
+
+        # Cached CSR representation used by the traversals (and its reverse), rebuilt lazily after any change.
+        self._csr = None
+        self._csr_version = -1
+        self._reverse_csr = None
+
+        # Traversal fields of every vertex as parallel arrays indexed by id (-1 stands for ∞ / None).
+        self._color = np.zeros(0, np.uint8)
+        self._d = np.zeros(0, np.int32)
+        self._f = np.zeros(0, np.int32)
+        self._parent = np.zeros(0, np.int32)
+
+        # Vertex ids in the order the last DFS finished them.
+        self._finish_order = np.zeros(0, np.int32)
+
+        # Incremented by every change to the graph (the only bookkeeping mutators do), cached results are keyed on it.
+        self._graph_version = 0
+        self._cycle_version = -1
+        self._cycle = False
+
+        for val in vertices or ():
+            self.add_vertex(val)
+
+    def __repr__(self):
+        indptr, indices, kinds = self._build_csr()
+        values = self._values
+
+        # Source id of every CSR entry, edge kinds are only mapped back to names here
+        sources = np.repeat(np.arange(len(values)), np.diff(indptr))
+        edge_list = [(values[u], values[v], _EDGE_KIND_NAMES[kind])
+                     for u, v, kind in zip(sources.tolist(), indices.tolist(), kinds.tolist())]
+        return f"Graph(vertices={values}, edges={edge_list})"
+
+    # Read-only mapping vertex value → Vertex view (views are built on access).
+    @property
+    def vertices(self):
+        return VertexMap(self)
+
+    # Indicates whether the DFS is up to date.
+    @property
+    def updated_dfs(self):
+        return self._dfs_version == self._graph_version
+
+    # Indicates whether the BFS (from source) is up to date.
+    @property
+    def updated_bfs(self):
+        return self._bfs_version == self._graph_version
+
+    # Returns the vertex with the given value if it exists.
+    def get(self, value):
+        return Vertex(self, value) if value in self._idx else None
+
+    # Adds a vertex to the graph if it does not already exists (value based).
+    def add_vertex(self, value):
+        if value not in self._idx:
+            self._graph_version += 1
+
+            self._idx[value] = len(self._values)
+            self._values.append(value)
+            self._adj.append(dict())
+            self._in_neighbors.append(set())
+
+    # Removes a vertex from the graph if it exists (value based).
+    def remove_vertex(self, value):
+        if value in self._idx:
+            u = self._idx.pop(value)
+
+            # Remove all outgoing edges from the vertex
+            for v in list(self._adj[u].keys()):
+                self._disconnect(u, v)
+
+            # Remove the vertex from the lists of the vertices pointing to it
+            for v in list(self._in_neighbors[u]):
+                self._disconnect(v, u)
+
+            # Remove the vertex itself, its id is reclaimed by the next compaction (CSR build or too many dead slots)
+            self._values[u] = _REMOVED
+            self._adj[u] = None
+            self._in_neighbors[u] = None
+            self._removed += 1
+            self._neighbor_view_cache.pop(value, None)
+            self._graph_version += 1
+
+            # Reclaim the dead slots once they are the majority, so removals without traversals cannot grow the lists
+            if 2 * self._removed > len(self._values):
+                self._compact()
+
+    # Checks if the graph has a cycle, reusing the last DFS (or cycle check) if the graph has not changed since.
+    def has_cycle(self):
+        if self.updated_dfs:
+            return self.dfs_cycle
+
+        if self._cycle_version != self._graph_version:
+            indptr, indices, kinds = self._build_csr()
+            self._cycle = bool(_detect_cycle_csr(indptr, indices, kinds))
+            self._cycle_version = self._graph_version
+
+        return self._cycle
+    
+    # Returns the type of the graph based on the edges.
+    def type(self):
+        if self.undirected_edges > 0 and self.directed_edges > 0:
+            return 'mixed'
+        elif self.undirected_edges > 0:
+            return 'undirected'
+        else:
+            return 'directed'
+
+    # Connects two vertices in a *directed* graph (value based).
+    # If an undirected edge already exists between the vertices, it will be overwritten.
+    def connect_directed(self, source, destination):
+        if source != destination:
+            self._graph_version += 1
+
+            # add vertices if they do not exist
+            self.add_vertex(source)
+            self.add_vertex(destination)
+            u, v = self._idx[source], self._idx[destination]
+
+            # If the connection already exists as undirected, remove it
+            if self._adj[u].get(v) == _UNDIRECTED:
+                self.undirected_edges -= 1
+                self._adj[u].pop(v, None)
+                self._adj[v].pop(u, None)
+                self._in_neighbors[u].discard(v)
+
+            # If the directed edge does not already exist, add it
+            if self._adj[u].get(v) != _DIRECTED:
+                self.directed_edges += 1
+                self._adj[u][v] = _DIRECTED
+                self._in_neighbors[v].add(u)
+
+    # Connects two vertices in a *undirected* graph (value based).
+    # If a directed edge already exists between the vertices, it will be overwritten.
+    def connect_undirected(self, source, destination):
+        if source != destination:
+            self._graph_version += 1
+
+            # add vertices if they do not exist
+            self.add_vertex(source)
+            self.add_vertex(destination)
+            u, v = self._idx[source], self._idx[destination]
+
+            # If the connection already exists as directed, remove it
+            if self._adj[u].get(v) == _DIRECTED:
+                self.directed_edges -= 1
+                self._adj[u].pop(v, None)
+                self._in_neighbors[v].discard(u)
+
+            if self._adj[v].get(u) == _DIRECTED:
+                self.directed_edges -= 1
+                self._adj[v].pop(u, None)
+                self._in_neighbors[u].discard(v)
+
+            # If the undirected edge does not already exist, add it
+            if self._adj[u].get(v) != _UNDIRECTED:
+                self.undirected_edges += 1
+                self._adj[u][v] = _UNDIRECTED
+                self._adj[v][u] = _UNDIRECTED
+                self._in_neighbors[v].add(u)
+                self._in_neighbors[u].add(v)
+
+    # Disconnects two vertices connection depending on the type of connection (value based).
+    # If the edge between destination → source is undirected, both directions will be removed.
+    # Otherwise, only the source → destination connection is removed (if it exists).
+    def disconnect(self, source, destination):
+        if source != destination and source in self._idx and destination in self._idx:
+            self._disconnect(self._idx[source], self._idx[destination])
+
+    # **helper** Disconnects two vertices by id, see disconnect().
+    def _disconnect(self, u, v):
+        self._graph_version += 1
+
+        if self._adj[v].get(u) == _UNDIRECTED:
+            self.undirected_edges -= 1
+            self._adj[v].pop(u, None)
+            self._adj[u].pop(v, None)
+            self._in_neighbors[u].discard(v)
+            self._in_neighbors[v].discard(u)
+
+        elif self._adj[u].get(v) == _DIRECTED:
+            self.directed_edges -= 1
+            self._adj[u].pop(v, None)
+            self._in_neighbors[v].discard(u)
+
+    # Returns the neighbors of a vertex (values) as a frozenset, reused until the graph changes.
+    def get_neighbors(self, value):
+        if value in self._idx:
+            cached = self._neighbor_view_cache.get(value)
+            if cached is not None and cached[0] == self._graph_version:
+                return cached[1]
+
+            values = self._values
+            neighbors = frozenset(values[v] for v in self._adj[self._idx[value]])
+            self._neighbor_view_cache[value] = (self._graph_version, neighbors)
+            return neighbors
+
+        else:
+            return frozenset()
+        
+    # **helper** Paints a vertex with a specific color (WHITE / GRAY / BLACK, or their legacy string names).
+    def paint(self, value, color):
+        color = _COLOR_CODES.get(color, color)
+        if value in self._idx and color in (WHITE, GRAY, BLACK):
+            self._build_csr()
+            self._color[self._idx[value]] = color
+
+            # The traversal fields no longer match a DFS / BFS run
+            self._dfs_version = -1
+            self._bfs_version = -1
+
+    # **helper** Resets the traversal fields of all vertices in the graph (a single fill per array).
+    def reset(self):
+        self._dfs_version = -1
+        self._bfs_version = -1
+        self.dfs_cycle = False
+
+        self._color.fill(WHITE)
+        self._d.fill(-1)
+        self._f.fill(-1)
+        self._parent.fill(-1)
+
+    # **helper** Renumbers the vertex ids densely (keeping their order) once vertices have been removed.
+    def _compact(self):
+        kept = [u for u, val in enumerate(self._values) if val is not _REMOVED]
+        new_id = {u: i for i, u in enumerate(kept)}
+
+        self._values = [self._values[u] for u in kept]
+        self._adj = [{new_id[v]: kind for v, kind in self._adj[u].items()} for u in kept]
+        self._in_neighbors = [{new_id[v] for v in self._in_neighbors[u]} for u in kept]
+        self._idx = {val: i for i, val in enumerate(self._values)}
+        self._removed = 0
+
+    # **helper** Builds (once per change) a Compressed Sparse Row view of the graph.
+    # Vertices keep their (insertion ordered) integer ids; the neighbors of id i are
+    # indices[indptr[i]:indptr[i + 1]] and kinds holds the matching edge kinds (_DIRECTED / _UNDIRECTED).
+    def _build_csr(self):
+        if self._csr_version != self._graph_version:
+            if self._removed:
+                self._compact()
+            n = len(self._values)
+
+            degrees = np.fromiter((len(neighbors) for neighbors in self._adj), np.int32, n)
+            indptr = np.zeros(n + 1, np.int32)
+            np.cumsum(degrees, out=indptr[1:])
+
+            m = int(indptr[-1])
+            indices = np.fromiter((v for neighbors in self._adj for v in neighbors), np.int32, m)
+            kinds = np.fromiter((kind for neighbors in self._adj for kind in neighbors.values()), np.uint8, m)
+
+            self._csr = (indptr, indices, kinds)
+            self._csr_version = self._graph_version
+            self._reverse_csr = None
+
+            # The traversal arrays are only reallocated when the number of vertices changes
+            if self._color.shape[0] != n:
+                self._color = np.empty(n, np.uint8)
+                self._d = np.empty(n, np.int32)
+                self._f = np.empty(n, np.int32)
+                self._parent = np.empty(n, np.int32)
+                self._finish_order = np.empty(n, np.int32)
+            self.reset()
+
+        return self._csr
+
+    # **helper** Builds (once per change) the reverse CSR: the in-neighbors of id i are
+    # in_indices[in_indptr[i]:in_indptr[i + 1]], in increasing id order.
+    def _build_reverse_csr(self):
+        indptr, indices, kinds = self._build_csr()
+        if self._reverse_csr is None:
+            n = len(indptr) - 1
+            in_indptr = np.zeros(n + 1, np.int32)
+            np.cumsum(np.bincount(indices, minlength=n), out=in_indptr[1:])
+
+            sources = np.repeat(np.arange(n, dtype=np.int32), np.diff(indptr))
+            in_indices = sources[np.argsort(indices, kind='stable')]
+
+            self._reverse_csr = (in_indptr, in_indices)
+
+        return self._reverse_csr
+
+    # Performs a depth-first search (DFS) on the graph, unless the last DFS is still up to date.
+    def dfs(self):
+        if self.updated_dfs:
+            return
+
+        indptr, indices, kinds = self._build_csr()
+        self.reset()
+        self.dfs_cycle = bool(_dfs_csr(indptr, indices, kinds, self._color, self._d, self._f, self._finish_order))
+
+        self._dfs_version = self._graph_version
+
+    # Performs a breadth-first search (BFS) starting from the source vertex, unless the last BFS from it is still up to date.
+    def bfs(self, source):
+        if self.updated_bfs and self.source == source:
+            return
+
+        indptr, indices, kinds = self._build_csr()
+        self.reset()
+        self.source = source
+        if not _COMPILED_KERNELS:
+            # The scalar loop would run in the interpreter, expand whole levels instead
+            _bfs_levels(indptr, indices, self._idx[source], self._color, self._d, self._parent)
+        elif len(self._values) >= _HYBRID_BFS_MIN_VERTICES and len(indices) >= _HYBRID_BFS_MIN_DEGREE * len(self._values):
+            in_indptr, in_indices = self._build_reverse_csr()
+            _bfs_hybrid_csr(indptr, indices, in_indptr, in_indices, self._idx[source], self._color, self._d, self._parent)
+        else:
+            _bfs_csr(indptr, indices, self._idx[source], self._color, self._d, self._parent)
+
+        self._bfs_version = self._graph_version
+
+    # **helper** Returns the BFS parent and d arrays from source, reusing a cached BFS if the graph has not changed since.
+    # A cache hit leaves the traversal fields (source, updated_bfs, the Vertex views) describing the last bfs() run.
+    def _bfs_result(self, source):
+        cached = self._bfs_cache.get(source)
+        if cached is not None and cached[0] == self._graph_version:
+            self._bfs_cache.move_to_end(source)
+            return cached[1], cached[2]
+
+        self.bfs(source)
+        self._bfs_cache[source] = (self._graph_version, self._parent.copy(), self._d.copy())
+        if len(self._bfs_cache) > _BFS_CACHE_SIZE:
+            self._bfs_cache.popitem(last=False)
+        return self._parent, self._d
+
+    # Returns the shortest path from source to target using BFS.
+    def path(self, source, target):
+        if source not in self._idx or target not in self._idx:
+            return []
+        if source == target:
+            return [source]
+
+        parent, d = self._bfs_result(source)
+        tmp = self._idx[target]
+        if d[tmp] < 0:
+            return []
+
+        # Walk the parent ids back from the target, filling the path (of known length) from its end
+        res = [None] * (int(d[tmp]) + 1)
+        for i in range(len(res) - 1, -1, -1):
+            res[i] = self._values[tmp]
+            tmp = parent[tmp]
+        return res
+    
+    # Returns a topological sort of the graph if it is a Directed Acyclic Graph (DAG): the reverse DFS finishing
+    # order, so the result never depends on earlier calls (an up to date DFS is simply reused).
+    def topological_sort(self):
+        if self.type() != 'directed':
+            return None
+
+        self.dfs()
+        if self.dfs_cycle:
+            return None
+
+        return [self._values[i] for i in self._finish_order[::-1].tolist()]